@@ -1,6 +1,6 @@
 """Application configuration loaded from environment variables via pydantic-settings."""
 
-from functools import lru_cache
+from __future__ import annotations
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -16,6 +16,7 @@ class Settings(BaseSettings):
         export PORTFOLIO_GOOGLE_SHEETS_ID="1BxiMVs0XRA5nFMdKvBdBZjgmUUqptlbs74OgVE2upms"
         export PORTFOLIO_SERVICE_ACCOUNT_JSON_PATH="/secrets/service-account.json"
         export PORTFOLIO_BACKFILL=true
+        export PORTFOLIO_LOG_LEVEL=DEBUG
     """
 
     model_config = SettingsConfigDict(
@@ -38,9 +39,18 @@ class Settings(BaseSettings):
         description="When True fetch full history from earliest investment date; "
         "when False fetch only the most recent 5 trading days",
     )
+    log_level: str = Field(
+        default="INFO",
+        description="Minimum loguru level written to stderr, e.g. DEBUG, INFO or WARNING",
+    )
+
+
+_settings: Settings | None = None
 
 
-@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Return a cached singleton Settings instance."""
-    return Settings()  # type: ignore[call-arg]
+    """Return the Settings singleton, loading it from the environment on first use."""
+    global _settings
+    if _settings is None:
+        _settings = Settings()  # type: ignore[call-arg]
+    return _settings
@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 import sys
-from datetime import datetime, timezone
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from functools import partial
 
+import numpy as np
 from loguru import logger
 
 from .config import get_settings
-from .models import ExchangeRateRecord, PriceRecord
+from .models import ExchangeRateRecord, PriceBatch
 from .price_fetcher import fetch_historical_prices, fetch_recent_prices
 from .rate_fetcher import fetch_historical_rates, fetch_recent_rates
 from .sheets_client import SheetsClient
@@ -17,31 +21,44 @@ from .sheets_client import SheetsClient
 # Logging setup
 # ------------------------------------------------------------------
 
-logger.remove()
-logger.add(
-    sys.stderr,
-    format=(
-        "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
-        "<level>{level: <8}</level> | "
-        "<cyan>{name}</cyan> | "
-        "{message}"
-    ),
-    level="DEBUG",
-    colorize=True,
-)
+
+def _configure_logging(level: str) -> None:
+    """Send log records at or above *level* to stderr with a compact format.
+
+    Records below *level* are dropped before formatting, so debug calls in the
+    fetch loops cost almost nothing unless ``PORTFOLIO_LOG_LEVEL=DEBUG`` is set.
+    """
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        format="{time:HH:mm:ss} | {level: <8} | {message}",
+        level=level.upper(),
+        colorize=sys.stderr.isatty(),
+    )
 
 
 # ------------------------------------------------------------------
 # Core logic
 # ------------------------------------------------------------------
 
+# Metadata keys recording the span of price history already fetched per ticker.
+_FIRST_FETCHED_KEY = "first_price_fetched:{}"
+_LAST_FETCHED_KEY = "last_price_fetched:{}"
+
+_EMPTY: frozenset[str] = frozenset()
+
 
 def _filter_new_prices(
-    records: list[PriceRecord],
-    existing: set[tuple[str, str]],
-) -> list[PriceRecord]:
-    """Return only records whose (ticker, date) pair is not yet in *existing*."""
-    return [r for r in records if (r.ticker, r.date) not in existing]
+    prices: PriceBatch,
+    existing: dict[str, set[str]],
+) -> PriceBatch:
+    """Return only rows whose date is not yet stored for their ticker in *existing*."""
+    mask = np.fromiter(
+        (d not in existing.get(t, _EMPTY) for t, d in zip(prices.tickers, prices.dates)),
+        dtype=bool,
+        count=len(prices),
+    )
+    return prices.take(mask)
 
 
 def _filter_new_rates(
@@ -52,11 +69,80 @@ def _filter_new_rates(
     return [r for r in records if r.date not in existing]
 
 
+def _last_weekday(today: date) -> str:
+    """Return the most recent weekday on or before *today* as ``YYYY-MM-DD``."""
+    while today.weekday() >= 5:  # Saturday / Sunday
+        today -= timedelta(days=1)
+    return today.isoformat()
+
+
+def _latest_price_dates(tickers: Iterable[str], dates: Iterable[str]) -> dict[str, str]:
+    """Return the latest date for each ticker across the paired *tickers* and *dates*."""
+    latest: dict[str, str] = {}
+    for ticker, day in zip(tickers, dates):
+        if day > latest.get(ticker, ""):
+            latest[ticker] = day
+    return latest
+
+
+def _price_fetch_starts(
+    tickers: list[str],
+    earliest_date: str,
+    metadata: dict[str, str],
+) -> dict[str, str]:
+    """Return the resume date for each ticker whose fetched history reaches *earliest_date*.
+
+    Tickers without stored high-water marks, or whose history starts after
+    *earliest_date* (a new, older investment was added), are left out so they
+    are fetched from *earliest_date* again.
+    """
+    starts: dict[str, str] = {}
+    for ticker in tickers:
+        first = metadata.get(_FIRST_FETCHED_KEY.format(ticker))
+        last = metadata.get(_LAST_FETCHED_KEY.format(ticker))
+        if first and last and first <= earliest_date:
+            starts[ticker] = last
+    return starts
+
+
+def _price_watermarks(
+    prices: PriceBatch,
+    earliest_date: str,
+    starts: dict[str, str],
+    metadata: dict[str, str],
+) -> dict[str, str]:
+    """Return the updated high-water-mark metadata for every ticker in *prices*."""
+    marks: dict[str, str] = {}
+    for ticker, last in _latest_price_dates(prices.tickers, prices.dates).items():
+        first_key = _FIRST_FETCHED_KEY.format(ticker)
+        marks[first_key] = metadata[first_key] if ticker in starts else earliest_date
+        marks[_LAST_FETCHED_KEY.format(ticker)] = last
+    return marks
+
+
+def _run_fetches(
+    fetch_prices: Callable[[], PriceBatch] | None,
+    fetch_rates: Callable[[], list[ExchangeRateRecord]] | None,
+) -> tuple[PriceBatch, list[ExchangeRateRecord]]:
+    """Run the price and rate fetches concurrently and return both results.
+
+    The rate fetch goes through the thread-safe ``Ticker.history`` endpoint, so
+    it overlaps with the batched price download instead of queueing behind it.
+    A ``None`` fetch is skipped and yields no rows.
+    """
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        prices_future = pool.submit(fetch_prices) if fetch_prices is not None else None
+        rates_future = pool.submit(fetch_rates) if fetch_rates is not None else None
+        prices = prices_future.result() if prices_future is not None else PriceBatch.empty()
+        rates = rates_future.result() if rates_future is not None else []
+    return prices, rates
+
+
 def main() -> None:
     """Run the portfolio updater pipeline."""
-    logger.info("=== Portfolio Updater starting ===")
-
     settings = get_settings()
+    _configure_logging(settings.log_level)
+    logger.info("=== Portfolio Updater starting ===")
     logger.info(
         "Config loaded — spreadsheet_id={} backfill={} service_account={}",
         settings.google_sheets_id,
@@ -70,33 +156,67 @@ def main() -> None:
         service_account_json_path=settings.service_account_json_path,
     )
 
-    # 2. Read all investments to derive the unique ticker list and earliest date.
-    investments = sheets.get_investments()
+    # 2. Read investments and existing records (for deduplication) in one batch.
+    state = sheets.load_all_state()
+    investments = state.investments
+    existing_prices = state.existing_prices
+    existing_rates = state.existing_rates
     if not investments:
         logger.warning("No investments found — nothing to do")
         return
 
-    unique_tickers: list[str] = sorted({inv.ticker for inv in investments})
-    logger.info("Unique tickers: {}", unique_tickers)
+    # Collect tickers and the earliest date in a single pass.
+    tickers_raw: list[str] = []
+    earliest_date: str = investments[0].date
+    for inv in investments:
+        tickers_raw.append(inv.ticker)
+        earliest_date = min(earliest_date, inv.date)
 
-    earliest_date: str = min(inv.date for inv in investments)
+    unique_tickers: list[str] = sorted(set(tickers_raw))
+    logger.info("Unique tickers: {}", unique_tickers)
     logger.info("Earliest investment date: {}", earliest_date)
 
-    # 3. Load existing records for deduplication.
-    existing_prices = sheets.get_existing_prices()
-    existing_rates = sheets.get_existing_rates()
+    # 3. Decide what to fetch, then fetch prices and rates concurrently.
+    fetch_prices: Callable[[], PriceBatch] | None = None
+    fetch_rates: Callable[[], list[ExchangeRateRecord]] | None = None
+    price_starts: dict[str, str] = {}
 
-    # 4. Fetch prices and rates.
     if settings.backfill:
-        logger.info("Backfill mode — fetching full history from {}", earliest_date)
-        raw_prices = fetch_historical_prices(unique_tickers, start_date=earliest_date)
-        raw_rates = fetch_historical_rates(start_date=earliest_date)
+        price_starts = _price_fetch_starts(unique_tickers, earliest_date, state.metadata)
+        logger.info(
+            "Backfill mode — fetching history from {} ({} ticker(s) resume from last fetch)",
+            earliest_date,
+            len(price_starts),
+        )
+        fetch_prices = partial(
+            fetch_historical_prices,
+            unique_tickers,
+            start_date=earliest_date,
+            per_ticker_start=price_starts,
+        )
+        fetch_rates = partial(fetch_historical_rates, start_date=earliest_date)
     else:
         logger.info("Incremental mode — fetching last 5 trading days")
-        raw_prices = fetch_recent_prices(unique_tickers, days=5)
-        raw_rates = fetch_recent_rates(days=5)
+        expected = _last_weekday(date.today())
+
+        latest_prices = {t: max(dates) for t, dates in existing_prices.items() if dates}
+        prices_since = min(latest_prices.get(t, "") for t in unique_tickers)
+        if prices_since >= expected:
+            logger.info("Prices already stored up to {} — skipping fetch", prices_since)
+        else:
+            fetch_prices = partial(
+                fetch_recent_prices, unique_tickers, days=5, since=prices_since or None
+            )
 
-    # 5. Deduplicate.
+        rates_since = max(existing_rates, default="")
+        if rates_since >= expected:
+            logger.info("Rates already stored up to {} — skipping fetch", rates_since)
+        else:
+            fetch_rates = partial(fetch_recent_rates, days=5, since=rates_since or None)
+
+    raw_prices, raw_rates = _run_fetches(fetch_prices, fetch_rates)
+
+    # 4. Deduplicate.
     new_prices = _filter_new_prices(raw_prices, existing_prices)
     new_rates = _filter_new_rates(raw_rates, existing_rates)
 
@@ -113,15 +233,21 @@ def main() -> None:
         len(new_rates),
     )
 
-    # 6. Write new records to sheets.
+    # 5. Write new records to sheets.
     sheets.append_prices(new_prices)
     sheets.append_rates(new_rates)
 
-    # 7. Update last_update metadata timestamp.
+    # 6. Update last_update timestamp and, after a backfill, the per-ticker
+    #    high-water marks in metadata.
     timestamp = datetime.now(tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-    sheets.update_metadata("last_update", timestamp)
+    metadata_updates = {"last_update": timestamp}
+    if settings.backfill:
+        metadata_updates.update(
+            _price_watermarks(raw_prices, earliest_date, price_starts, state.metadata)
+        )
+    sheets.update_metadata_map(metadata_updates)
 
-    # 8. Summary.
+    # 7. Summary.
     logger.info(
         "=== Done — wrote {} price record(s) and {} exchange rate record(s) ===",
         len(new_prices),
@@ -1,21 +1,80 @@
-"""Pydantic V2 data models for the portfolio updater."""
+"""Data models for the portfolio updater (Pydantic V2 models plus columnar batches)."""
 
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
 from typing import Literal
 
-from pydantic import BaseModel, Field
+import numpy as np
+import numpy.typing as npt
+from pydantic import BaseModel, ConfigDict, Field
 
 
-class PriceRecord(BaseModel):
-    """Represents a single closing price for a ticker on a given date."""
+@dataclass(frozen=True)
+class PriceBatch:
+    """Closing prices stored column-wise; row *i* is ``(tickers[i], dates[i], closes[i])``.
 
-    ticker: str = Field(..., description="Asset ticker symbol, e.g. AAPL or 2330.TW")
-    date: str = Field(..., description="Trading date in YYYY-MM-DD format")
-    close: float = Field(..., description="Closing price in the asset's native currency")
+    Used on the fetch → dedup → write path instead of one model object per
+    row, which keeps large backfills compact.
+    """
+
+    tickers: npt.NDArray[np.object_]
+    dates: npt.NDArray[np.object_]
+    closes: npt.NDArray[np.float64]
+
+    @classmethod
+    def from_columns(
+        cls,
+        tickers: Sequence[str],
+        dates: Sequence[str],
+        closes: Sequence[float],
+    ) -> PriceBatch:
+        """Build a batch from three equally long column sequences."""
+        return cls(
+            tickers=np.asarray(tickers, dtype=object),
+            dates=np.asarray(dates, dtype=object),
+            closes=np.asarray(closes, dtype=np.float64),
+        )
+
+    @classmethod
+    def empty(cls) -> PriceBatch:
+        """Return a batch with no rows."""
+        return cls.from_columns([], [], [])
+
+    @classmethod
+    def concat(cls, batches: Iterable[PriceBatch]) -> PriceBatch:
+        """Join *batches* end to end."""
+        parts = list(batches)
+        if not parts:
+            return cls.empty()
+        return cls(
+            tickers=np.concatenate([b.tickers for b in parts]),
+            dates=np.concatenate([b.dates for b in parts]),
+            closes=np.concatenate([b.closes for b in parts]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.closes)
+
+    def take(self, indexer: npt.NDArray[np.bool_] | npt.NDArray[np.intp]) -> PriceBatch:
+        """Return the rows selected by a boolean mask or integer index array."""
+        return PriceBatch(
+            tickers=self.tickers[indexer],
+            dates=self.dates[indexer],
+            closes=self.closes[indexer],
+        )
+
+    def sorted(self) -> PriceBatch:
+        """Return the rows ordered by ticker, then date."""
+        return self.take(np.lexsort((self.dates, self.tickers)))
 
 
 class ExchangeRateRecord(BaseModel):
     """Represents a USD/TWD exchange rate on a given date."""
 
+    model_config = ConfigDict(frozen=True)
+
     date: str = Field(..., description="Trading date in YYYY-MM-DD format")
     usd_twd: float = Field(..., description="USD to TWD exchange rate")
 
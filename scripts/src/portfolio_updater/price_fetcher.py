@@ -2,15 +2,23 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
 
-import yfinance as yf
+import numpy as np
+import pandas as pd
 from loguru import logger
 
-from .models import PriceRecord
+from .models import PriceBatch
+from .yahoo import download, history
 
+# Upper bound on concurrent per-ticker downloads when the batched call fails.
+_MAX_WORKERS = 8
 
-def fetch_recent_prices(tickers: list[str], days: int = 5) -> list[PriceRecord]:
+
+def fetch_recent_prices(
+    tickers: list[str], days: int = 5, since: str | None = None
+) -> PriceBatch:
     """Fetch the most recent *days* trading-day closing prices for each ticker.
 
     Parameters
@@ -19,17 +27,23 @@ def fetch_recent_prices(tickers: list[str], days: int = 5) -> list[PriceRecord]:
         List of yfinance-compatible ticker symbols, e.g. ``["AAPL", "2330.TW"]``.
     days:
         Number of recent trading days to fetch.  Defaults to 5.
+    since:
+        Optional ``YYYY-MM-DD`` date up to which every ticker is already stored.
+        When it falls inside the default lookback window the download starts
+        there instead.
 
     Returns
     -------
-    list[PriceRecord]
-        Flat list of price records across all tickers, sorted by ticker then date.
+    PriceBatch
+        Price rows across all tickers, sorted by ticker then date.
         Tickers that fail to download are skipped with a warning.
     """
     # Fetch a window that is comfortably larger than *days* to account for
     # weekends and public holidays in different markets.
     lookback = days * 3
     start = (date.today() - timedelta(days=lookback)).isoformat()
+    if since is not None:
+        start = max(start, since)
     logger.info(
         "Fetching recent {} trading days of prices for {} ticker(s) (window start: {})",
         days,
@@ -39,7 +53,11 @@ def fetch_recent_prices(tickers: list[str], days: int = 5) -> list[PriceRecord]:
     return _download(tickers, start=start, tail=days)
 
 
-def fetch_historical_prices(tickers: list[str], start_date: str) -> list[PriceRecord]:
+def fetch_historical_prices(
+    tickers: list[str],
+    start_date: str,
+    per_ticker_start: dict[str, str] | None = None,
+) -> PriceBatch:
     """Fetch all closing prices from *start_date* to today for each ticker.
 
     Parameters
@@ -48,19 +66,34 @@ def fetch_historical_prices(tickers: list[str], start_date: str) -> list[PriceRe
         List of yfinance-compatible ticker symbols.
     start_date:
         ISO-format date string ``YYYY-MM-DD`` representing the earliest date to fetch.
+    per_ticker_start:
+        Optional per-ticker override of *start_date*, e.g. the last date already
+        fetched for that ticker.  Tickers sharing a start date are downloaded
+        together.
 
     Returns
     -------
-    list[PriceRecord]
-        Flat list of price records across all tickers.
+    PriceBatch
+        Price rows across all tickers, sorted by ticker then date.
         Tickers that fail to download are skipped with a warning.
     """
-    logger.info(
-        "Fetching historical prices for {} ticker(s) from {}",
-        len(tickers),
-        start_date,
-    )
-    return _download(tickers, start=start_date, tail=None)
+    starts = per_ticker_start or {}
+    groups: dict[str, list[str]] = {}
+    for ticker in tickers:
+        groups.setdefault(starts.get(ticker, start_date), []).append(ticker)
+
+    batches: list[PriceBatch] = []
+    for start, group in sorted(groups.items()):
+        logger.info(
+            "Fetching historical prices for {} ticker(s) from {}",
+            len(group),
+            start,
+        )
+        batches.append(_download(group, start=start, tail=None))
+
+    if len(batches) == 1:
+        return batches[0]
+    return PriceBatch.concat(batches).sorted()
 
 
 # ------------------------------------------------------------------
@@ -68,8 +101,13 @@ def fetch_historical_prices(tickers: list[str], start_date: str) -> list[PriceRe
 # ------------------------------------------------------------------
 
 
-def _download(tickers: list[str], start: str, tail: int | None) -> list[PriceRecord]:
-    """Download price data for *tickers* and convert to ``PriceRecord`` objects.
+def _download(tickers: list[str], start: str, tail: int | None) -> PriceBatch:
+    """Download price data for *tickers* and convert it to a ``PriceBatch``.
+
+    All tickers are requested in a single multi-ticker ``yf.download`` call so
+    that the fetch costs one round-trip instead of one per symbol.  If the
+    batched call or its parsing fails, or some tickers come back without data,
+    those tickers are retried on their own.
 
     Parameters
     ----------
@@ -80,49 +118,138 @@ def _download(tickers: list[str], start: str, tail: int | None) -> list[PriceRec
     tail:
         If provided, only the last *tail* rows per ticker are retained.
     """
-    records: list[PriceRecord] = []
-
-    for ticker in tickers:
-        try:
-            records.extend(_download_single(ticker, start=start, tail=tail))
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Failed to fetch prices for ticker '{}': {}", ticker, exc)
-
-    logger.debug("Total price records fetched: {}", len(records))
-    return records
-
+    if not tickers:
+        return PriceBatch.empty()
+
+    logger.debug("Downloading {} ticker(s) from {}", len(tickers), start)
+    try:
+        data = download(
+            " ".join(tickers),
+            start=start,
+            auto_adjust=True,
+            progress=False,
+            group_by="ticker",
+            threads=True,
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Batched price download failed, falling back to per-ticker: {}", exc)
+        return _download_each(tickers, start=start, tail=tail)
 
-def _download_single(ticker: str, start: str, tail: int | None) -> list[PriceRecord]:
+    # yf.download swallows per-ticker errors, so a batch in which every ticker
+    # failed comes back as an empty frame rather than raising.
+    if data.empty:
+        logger.warning("No price data returned for tickers {}, retrying per-ticker", tickers)
+        return _download_each(tickers, start=start, tail=tail)
+
+    try:
+        # Multi-ticker results carry a (ticker, field) column index; a plain
+        # single-level index means yfinance returned just the one frame.
+        if isinstance(data.columns, pd.MultiIndex):
+            prices = _parse_multi_closes(tickers, data, tail=tail)
+        else:
+            prices = _parse_closes(tickers[0], data, tail=tail)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Failed to parse batched prices, falling back to per-ticker: {}", exc)
+        return _download_each(tickers, start=start, tail=tail)
+
+    returned = set(prices.tickers.tolist())
+    missing = [t for t in tickers if t not in returned]
+    if missing:
+        logger.warning("No batched data for ticker(s) {}, retrying per-ticker", missing)
+        prices = PriceBatch.concat([prices, _download_each(missing, start=start, tail=tail)])
+        prices = prices.sorted()
+
+    logger.debug("Total price records fetched: {}", len(prices))
+    return prices
+
+
+def _download_each(tickers: list[str], start: str, tail: int | None) -> PriceBatch:
+    """Download *tickers* individually on a thread pool, skipping any that fail.
+
+    Each download is network-bound, so threads overlap the round-trips while
+    keeping a failing symbol isolated from the rest.
+    """
+    batches: list[PriceBatch] = []
+    max_workers = min(_MAX_WORKERS, len(tickers))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_download_single, ticker, start, tail): ticker for ticker in tickers
+        }
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                batches.append(future.result())
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Failed to fetch prices for ticker '{}': {}", ticker, exc)
+
+    # Completion order is arbitrary; restore the ticker-then-date ordering.
+    prices = PriceBatch.concat(batches).sorted()
+    logger.debug("Total price records fetched: {}", len(prices))
+    return prices
+
+
+def _download_single(ticker: str, start: str, tail: int | None) -> PriceBatch:
     """Download and parse closing prices for a single *ticker*.
 
     Raises on network / parsing errors so that the caller can decide whether
     to skip or propagate.
     """
     logger.debug("Downloading '{}' from {}", ticker, start)
-    data = yf.download(
-        ticker,
-        start=start,
-        auto_adjust=True,
-        progress=False,
-        multi_level_index=False,
-    )
+    # Runs on the _download_each thread pool, so use the thread-safe per-ticker
+    # endpoint rather than download().
+    data = history(ticker, start=start)
 
     if data.empty:
         logger.warning("No data returned for ticker '{}'", ticker)
-        return []
+        return PriceBatch.empty()
+
+    return _parse_closes(ticker, data, tail=tail)
+
 
-    close_series = data["Close"].dropna()
+def _parse_closes(ticker: str, frame: pd.DataFrame, tail: int | None) -> PriceBatch:
+    """Convert the ``Close`` column of a single-ticker *frame* to a ``PriceBatch``."""
+    close_series = frame["Close"].dropna()
 
     if tail is not None:
         close_series = close_series.tail(tail)
 
-    price_records: list[PriceRecord] = [
-        PriceRecord(
-            ticker=ticker,
-            date=idx.date().isoformat(),  # type: ignore[union-attr]
-            close=float(close_val),
-        )
-        for idx, close_val in close_series.items()
-    ]
-    logger.debug("Parsed {} price records for '{}'", len(price_records), ticker)
-    return price_records
+    # Format dates and convert closes column-wise in pandas.
+    dates = close_series.index.strftime("%Y-%m-%d").to_numpy(dtype=object)  # type: ignore[attr-defined]
+    prices = PriceBatch(
+        tickers=np.full(len(dates), ticker, dtype=object),
+        dates=dates,
+        closes=close_series.to_numpy(dtype=np.float64),
+    )
+    logger.debug("Parsed {} price records for '{}'", len(prices), ticker)
+    return prices
+
+
+def _parse_multi_closes(tickers: list[str], data: pd.DataFrame, tail: int | None) -> PriceBatch:
+    """Convert the ``Close`` columns of a multi-ticker *data* frame to a ``PriceBatch``.
+
+    The frame is reshaped to long (date, ticker, close) form in pandas, so no
+    per-ticker Python loop is needed.  Rows keep the order of *tickers*, then date.
+    yfinance upper-cases symbols in multi-ticker results, so columns are looked
+    up case-insensitively while the rows keep the tickers as spelled in *tickers*.
+    """
+    close_df = data.xs("Close", axis=1, level=1)
+    found = [t for t in tickers if t.upper() in close_df.columns]
+    close_df = close_df.loc[:, [t.upper() for t in found]].set_axis(found, axis=1)
+
+    long = (
+        close_df.rename_axis("date")
+        .reset_index()
+        .melt(id_vars="date", var_name="ticker", value_name="close")
+        .dropna(subset=["close"])
+    )
+    if tail is not None:
+        long = long.groupby("ticker", sort=False).tail(tail)
+
+    prices = PriceBatch(
+        tickers=long["ticker"].to_numpy(dtype=object),
+        dates=long["date"].dt.strftime("%Y-%m-%d").to_numpy(dtype=object),
+        closes=long["close"].to_numpy(dtype=np.float64),
+    )
+    logger.debug("Parsed {} price records for {} ticker(s)", len(prices), len(close_df.columns))
+    return prices
@@ -4,21 +4,24 @@ from __future__ import annotations
 
 from datetime import date, timedelta
 
-import yfinance as yf
 from loguru import logger
 
 from .models import ExchangeRateRecord
+from .yahoo import history
 
 _USDTWD_TICKER = "USDTWD=X"
 
 
-def fetch_recent_rates(days: int = 5) -> list[ExchangeRateRecord]:
+def fetch_recent_rates(days: int = 5, since: str | None = None) -> list[ExchangeRateRecord]:
     """Fetch the most recent *days* trading-day USD/TWD exchange rates.
 
     Parameters
     ----------
     days:
         Number of recent trading days to fetch.  Defaults to 5.
+    since:
+        Optional ``YYYY-MM-DD`` date already known to be stored.  When it falls
+        inside the default lookback window the download starts there instead.
 
     Returns
     -------
@@ -28,6 +31,8 @@ def fetch_recent_rates(days: int = 5) -> list[ExchangeRateRecord]:
     """
     lookback = days * 3
     start = (date.today() - timedelta(days=lookback)).isoformat()
+    if since is not None:
+        start = max(start, since)
     logger.info(
         "Fetching recent {} trading days of USD/TWD rates (window start: {})",
         days,
@@ -71,13 +76,9 @@ def _download(start: str, tail: int | None) -> list[ExchangeRateRecord]:
     """
     try:
         logger.debug("Downloading {} from {}", _USDTWD_TICKER, start)
-        data = yf.download(
-            _USDTWD_TICKER,
-            start=start,
-            auto_adjust=True,
-            progress=False,
-            multi_level_index=False,
-        )
+        # A single symbol, so use the thread-safe per-ticker endpoint; this lets
+        # the rate fetch run alongside the batched (serialised) price download.
+        data = history(_USDTWD_TICKER, start=start)
     except Exception as exc:  # noqa: BLE001
         logger.warning("Failed to fetch USD/TWD rates: {}", exc)
         return []
@@ -91,12 +92,12 @@ def _download(start: str, tail: int | None) -> list[ExchangeRateRecord]:
     if tail is not None:
         close_series = close_series.tail(tail)
 
+    # Format dates and convert closes column-wise in pandas, then pair them up.
+    # The values come straight out of a typed pandas frame, so skip validation.
+    dates = close_series.index.strftime("%Y-%m-%d").tolist()  # type: ignore[attr-defined]
+    closes = close_series.to_numpy(dtype=float).tolist()
     records: list[ExchangeRateRecord] = [
-        ExchangeRateRecord(
-            date=idx.date().isoformat(),  # type: ignore[union-attr]
-            usd_twd=float(close_val),
-        )
-        for idx, close_val in close_series.items()
+        ExchangeRateRecord.model_construct(date=d, usd_twd=c) for d, c in zip(dates, closes)
     ]
     logger.debug("Parsed {} USD/TWD rate records", len(records))
     return records
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-from typing import Any
+import time
+from typing import Any, NamedTuple
 
 import gspread
 from google.oauth2.service_account import Credentials
 from loguru import logger
 
-from .models import ExchangeRateRecord, Investment, PriceRecord
+from .models import ExchangeRateRecord, Investment, PriceBatch
 
 # Scopes required for reading and writing Sheets and Drive metadata.
 _SCOPES: list[str] = [
@@ -22,6 +23,36 @@ _SHEET_PRICES = "prices"
 _SHEET_RATES = "exchange_rates"
 _SHEET_METADATA = "metadata"
 
+# Large appends (e.g. backfill) are split into chunks to stay under the
+# per-minute write quota; rate-limited (HTTP 429) chunks are retried.
+_APPEND_CHUNK_ROWS = 1000
+_APPEND_CHUNK_PAUSE_SECONDS = 1.0
+_RATE_LIMIT_MAX_ATTEMPTS = 5
+_RATE_LIMIT_MAX_WAIT_SECONDS = 30.0
+
+_INVESTMENT_HEADERS: list[str] = [
+    "id",
+    "batch_id",
+    "ticker",
+    "name",
+    "market",
+    "date",
+    "units",
+    "price_per_unit",
+    "exchange_rate",
+    "fees",
+    "tags",
+]
+
+
+class SheetState(NamedTuple):
+    """Everything the updater reads from the spreadsheet before fetching."""
+
+    investments: list[Investment]
+    existing_prices: dict[str, set[str]]
+    existing_rates: set[str]
+    metadata: dict[str, str]
+
 
 class SheetsClient:
     """Thin wrapper around gspread that exposes typed read/write helpers.
@@ -51,6 +82,49 @@ class SheetsClient:
     # Read helpers
     # ------------------------------------------------------------------
 
+    def load_all_state(self) -> SheetState:
+        """Read investments, existing price/rate keys and metadata in one ``batchGet`` call.
+
+        Falls back to the individual read helpers when the batched request is
+        rejected, e.g. because the prices, exchange_rates or metadata tab does
+        not exist yet.
+        """
+        logger.debug("Reading investments, prices, exchange rates and metadata in one batch…")
+        try:
+            response: dict[str, Any] = self._spreadsheet.values_batch_get(
+                ranges=[
+                    f"{_SHEET_INVESTMENTS}!A:K",
+                    f"{_SHEET_PRICES}!A2:B",
+                    f"{_SHEET_RATES}!A2:A",
+                    f"{_SHEET_METADATA}!A2:B",
+                ]
+            )
+        except gspread.exceptions.APIError as exc:
+            logger.warning("Batched sheet read failed, reading sheets one by one: {}", exc)
+            return SheetState(
+                investments=self.get_investments(),
+                existing_prices=self.get_existing_prices(),
+                existing_rates=self.get_existing_rates(),
+                metadata=self.get_metadata_map(),
+            )
+
+        investment_values, price_values, rate_values, metadata_values = (
+            value_range.get("values", []) for value_range in response["valueRanges"]
+        )
+        state = SheetState(
+            investments=_parse_investments(investment_values),
+            existing_prices=_parse_price_keys(price_values),
+            existing_rates=_parse_rate_keys(rate_values),
+            metadata=_parse_metadata(metadata_values),
+        )
+        logger.info(
+            "Loaded {} investments, {} existing price records, {} existing exchange rate records",
+            len(state.investments),
+            sum(len(dates) for dates in state.existing_prices.values()),
+            len(state.existing_rates),
+        )
+        return state
+
     def get_investments(self) -> list[Investment]:
         """Return all rows from the investments sheet as ``Investment`` objects.
 
@@ -59,44 +133,25 @@ class SheetsClient:
         """
         logger.debug("Reading investments sheet…")
         worksheet = self._spreadsheet.worksheet(_SHEET_INVESTMENTS)
-        rows: list[dict[str, Any]] = worksheet.get_all_records(
-            expected_headers=[
-                "id",
-                "batch_id",
-                "ticker",
-                "name",
-                "market",
-                "date",
-                "units",
-                "price_per_unit",
-                "exchange_rate",
-                "fees",
-                "tags",
-            ]
-        )
-        investments: list[Investment] = []
-        for row in rows:
-            try:
-                investments.append(Investment.model_validate(row))
-            except Exception as exc:  # noqa: BLE001
-                logger.warning("Skipping invalid investment row {}: {}", row, exc)
+        investments = _parse_investments(worksheet.get_values("A:K"))
         logger.info("Loaded {} investments", len(investments))
         return investments
 
-    def get_existing_prices(self) -> set[tuple[str, str]]:
-        """Return a set of (ticker, date) tuples already present in the prices sheet."""
+    def get_existing_prices(self) -> dict[str, set[str]]:
+        """Return the dates already present in the prices sheet, grouped by ticker."""
         logger.debug("Reading existing prices for deduplication…")
         try:
             worksheet = self._spreadsheet.worksheet(_SHEET_PRICES)
         except gspread.WorksheetNotFound:
             logger.warning("Prices sheet '{}' not found; treating as empty", _SHEET_PRICES)
-            return set()
+            return {}
 
-        rows: list[dict[str, Any]] = worksheet.get_all_records()
-        existing: set[tuple[str, str]] = {
-            (str(row["ticker"]), str(row["date"])) for row in rows if row.get("ticker") and row.get("date")
-        }
-        logger.info("Found {} existing price records", len(existing))
+        # Columns are ticker, date, close; only the first two matter here.
+        existing = _parse_price_keys(worksheet.get_values("A2:B"))
+        logger.info(
+            "Found {} existing price records",
+            sum(len(dates) for dates in existing.values()),
+        )
         return existing
 
     def get_existing_rates(self) -> set[str]:
@@ -110,29 +165,47 @@ class SheetsClient:
             )
             return set()
 
-        rows: list[dict[str, Any]] = worksheet.get_all_records()
-        existing: set[str] = {str(row["date"]) for row in rows if row.get("date")}
+        # Columns are date, usd_twd; only the date matters here.
+        existing = _parse_rate_keys(worksheet.get_values("A2:A"))
         logger.info("Found {} existing exchange rate records", len(existing))
         return existing
 
+    def get_metadata_map(self) -> dict[str, str]:
+        """Return every key/value pair stored in the metadata sheet."""
+        logger.debug("Reading metadata…")
+        try:
+            worksheet = self._spreadsheet.worksheet(_SHEET_METADATA)
+        except gspread.WorksheetNotFound:
+            logger.warning("Metadata sheet '{}' not found; treating as empty", _SHEET_METADATA)
+            return {}
+
+        metadata = _parse_metadata(worksheet.get_values("A2:B"))
+        logger.info("Found {} metadata key(s)", len(metadata))
+        return metadata
+
     # ------------------------------------------------------------------
     # Write helpers
     # ------------------------------------------------------------------
 
-    def append_prices(self, records: list[PriceRecord]) -> None:
-        """Append price records to the prices sheet.
+    def append_prices(self, prices: PriceBatch) -> None:
+        """Append the rows of *prices* to the prices sheet.
 
         Creates the sheet with a header row if it does not yet exist.
         """
-        if not records:
+        if not prices:
             logger.debug("No new price records to append")
             return
 
         worksheet = self._get_or_create_worksheet(
             _SHEET_PRICES, headers=["ticker", "date", "close"]
         )
-        rows = [[r.ticker, r.date, r.close] for r in records]
-        worksheet.append_rows(rows, value_input_option="USER_ENTERED")
+        rows: list[list[Any]] = [
+            [ticker, day, close]
+            for ticker, day, close in zip(
+                prices.tickers.tolist(), prices.dates.tolist(), prices.closes.tolist()
+            )
+        ]
+        _append_in_chunks(worksheet, rows)
         logger.info("Appended {} price record(s) to '{}'", len(rows), _SHEET_PRICES)
 
     def append_rates(self, records: list[ExchangeRateRecord]) -> None:
@@ -148,7 +221,7 @@ class SheetsClient:
             _SHEET_RATES, headers=["date", "usd_twd"]
         )
         rows = [[r.date, r.usd_twd] for r in records]
-        worksheet.append_rows(rows, value_input_option="USER_ENTERED")
+        _append_in_chunks(worksheet, rows)
         logger.info("Appended {} exchange rate record(s) to '{}'", len(rows), _SHEET_RATES)
 
     def update_metadata(self, key: str, value: str) -> None:
@@ -157,20 +230,38 @@ class SheetsClient:
         If a row for ``key`` already exists it is updated in place;
         otherwise a new row is appended.
         """
-        logger.debug("Updating metadata: {} = {}", key, value)
+        self.update_metadata_map({key: value})
+
+    def update_metadata_map(self, values: dict[str, str]) -> None:
+        """Set every key in *values* in the metadata sheet.
+
+        Existing keys are updated in place with one ``batch_update`` and new
+        keys are appended with one ``append_rows`` call.
+        """
+        if not values:
+            return
+
+        logger.debug("Updating metadata: {}", values)
         worksheet = self._get_or_create_worksheet(
             _SHEET_METADATA, headers=["key", "value"]
         )
-        rows: list[dict[str, Any]] = worksheet.get_all_records()
-        for idx, row in enumerate(rows, start=2):  # row 1 is the header
-            if str(row.get("key", "")) == key:
-                # Column B (index 2) holds the value.
-                worksheet.update_cell(idx, 2, value)
-                logger.info("Updated metadata key '{}' at row {}", key, idx)
-                return
+        # Only column A (the keys) is needed to locate the rows.
+        rows_by_key = {k: idx for idx, k in enumerate(worksheet.col_values(1)) if idx}
+        updates: list[dict[str, Any]] = []
+        appends: list[list[Any]] = []
+        for key, value in values.items():
+            if key in rows_by_key:
+                # Column B holds the value; sheet rows are 1-based.
+                updates.append({"range": f"B{rows_by_key[key] + 1}", "values": [[value]]})
+            else:
+                appends.append([key, value])
 
-        worksheet.append_row([key, value], value_input_option="USER_ENTERED")
-        logger.info("Appended new metadata key '{}'", key)
+        if updates:
+            worksheet.batch_update(updates, value_input_option="USER_ENTERED")
+            logger.info("Updated {} metadata key(s)", len(updates))
+        if appends:
+            worksheet.append_rows(appends, value_input_option="USER_ENTERED")
+            logger.info("Appended {} new metadata key(s)", len(appends))
 
     # ------------------------------------------------------------------
     # Private helpers
@@ -189,3 +280,132 @@ class SheetsClient:
             )
             worksheet.append_row(headers, value_input_option="USER_ENTERED")
             return worksheet
+
+
+# ------------------------------------------------------------------
+# Chunked writes
+# ------------------------------------------------------------------
+
+
+def _append_in_chunks(
+    worksheet: gspread.Worksheet,
+    rows: list[list[Any]],
+    chunk: int = _APPEND_CHUNK_ROWS,
+) -> None:
+    """Append *rows* to *worksheet* in chunks of at most *chunk* rows.
+
+    Chunks are separated by a short pause, and each chunk is retried with
+    exponential backoff when the Sheets API answers with HTTP 429.
+    """
+    for start in range(0, len(rows), chunk):
+        if start:
+            time.sleep(_APPEND_CHUNK_PAUSE_SECONDS)
+        _append_with_backoff(worksheet, rows[start : start + chunk])
+
+
+def _append_with_backoff(worksheet: gspread.Worksheet, rows: list[list[Any]]) -> None:
+    """Append *rows* in one request, retrying on rate-limit errors."""
+    wait = 1.0
+    for attempt in range(1, _RATE_LIMIT_MAX_ATTEMPTS + 1):
+        try:
+            worksheet.append_rows(rows, value_input_option="USER_ENTERED")
+            return
+        except gspread.exceptions.APIError as exc:
+            if exc.code != 429 or attempt == _RATE_LIMIT_MAX_ATTEMPTS:
+                raise
+            logger.warning(
+                "Rate limited appending to '{}' (attempt {}/{}); retrying in {:.0f}s",
+                worksheet.title,
+                attempt,
+                _RATE_LIMIT_MAX_ATTEMPTS,
+                wait,
+            )
+            time.sleep(wait)
+            wait = min(wait * 2, _RATE_LIMIT_MAX_WAIT_SECONDS)
+
+
+# ------------------------------------------------------------------
+# Row parsing
+# ------------------------------------------------------------------
+
+
+def _parse_investments(values: list[list[str]]) -> list[Investment]:
+    """Parse raw investments sheet *values* (header row first) into ``Investment`` objects.
+
+    When the header matches ``_INVESTMENT_HEADERS`` the rows are read by
+    position without pydantic validation; otherwise each row is keyed by its
+    header and validated.  Invalid rows are skipped with a warning.
+    """
+    if not values:
+        return []
+
+    header, *body = values
+    normalised = [h.strip().lower() for h in header[: len(_INVESTMENT_HEADERS)]]
+    if normalised != _INVESTMENT_HEADERS:
+        logger.warning("Unexpected investments header {}; parsing rows by name", header)
+        return _parse_investments_by_name(header, body)
+
+    investments: list[Investment] = []
+    for row in body:
+        if not row or not row[0]:
+            continue
+        try:
+            investments.append(_investment_from_row(row))
+        except (ValueError, IndexError) as exc:
+            logger.warning("Skipping invalid investment row {}: {}", row, exc)
+    return investments
+
+
+def _investment_from_row(row: list[str]) -> Investment:
+    """Build an ``Investment`` from a row laid out in ``_INVESTMENT_HEADERS`` order.
+
+    Validation is skipped, so the market and numeric columns are checked here.
+    """
+    market = row[4]
+    if market not in ("TW", "US"):
+        raise ValueError(f"unknown market {market!r}")
+    return Investment.model_construct(
+        id=row[0],
+        batch_id=row[1],
+        ticker=row[2],
+        name=row[3],
+        market=market,
+        date=row[5],
+        units=float(row[6]),
+        price_per_unit=float(row[7]),
+        exchange_rate=float(row[8]),
+        fees=float(row[9]),
+        tags=row[10] if len(row) > 10 else "",
+    )
+
+
+def _parse_investments_by_name(header: list[str], body: list[list[str]]) -> list[Investment]:
+    """Validate *body* rows keyed by *header* into ``Investment`` objects."""
+    keys = [h.strip().lower() for h in header]
+    investments: list[Investment] = []
+    for values in body:
+        row = dict(zip(keys, values + [""] * (len(keys) - len(values))))
+        try:
+            investments.append(Investment.model_validate(row))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Skipping invalid investment row {}: {}", row, exc)
+    return investments
+
+
+def _parse_price_keys(rows: list[list[str]]) -> dict[str, set[str]]:
+    """Return the dates in positional price *rows*, grouped by ticker."""
+    existing: dict[str, set[str]] = {}
+    for row in rows:
+        if len(row) >= 2 and row[0] and row[1]:
+            existing.setdefault(row[0], set()).add(row[1])
+    return existing
+
+
+def _parse_rate_keys(rows: list[list[str]]) -> set[str]:
+    """Return the dates from positional exchange rate *rows*."""
+    return {row[0] for row in rows if row and row[0]}
+
+
+def _parse_metadata(rows: list[list[str]]) -> dict[str, str]:
+    """Return the key/value pairs from positional metadata *rows*."""
+    return {row[0]: row[1] if len(row) > 1 else "" for row in rows if row and row[0]}
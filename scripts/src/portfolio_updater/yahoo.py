@@ -0,0 +1,132 @@
+"""Shared yfinance download helpers backed by a small on-disk cache."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import yfinance as yf
+from loguru import logger
+
+# Downloaded frames are reused for the rest of the day they were fetched on (and
+# at most 24 hours); a new day always downloads afresh to pick up new closes.
+#
+# No HTTP session is passed to yfinance: since 0.2.54 it keeps one shared
+# curl_cffi session (connection, TLS and cookie reuse) for every download and
+# rejects plain ``requests`` sessions such as ``requests_cache.CachedSession``.
+# Cross-run caching is handled by the files below instead.
+_CACHE_DIR = Path("~/.cache/portfolio_updater").expanduser()
+_CACHE_TTL_SECONDS = 86_400
+
+# yf.download collects its results in module-level state (yfinance.shared), so
+# concurrent calls can mix or drop each other's frames; only one runs at a time.
+_DOWNLOAD_LOCK = threading.Lock()
+
+
+def download(tickers: str, start: str, **kwargs: Any) -> pd.DataFrame:
+    """Return ``yf.download(tickers, start=start, **kwargs)``, served from cache when fresh.
+
+    The cache key covers *tickers*, *start*, today's date (the implicit end of
+    the window, whose close may not be settled yet) and every keyword argument,
+    so calls that would shape the frame differently never share an entry.  A
+    missing, stale or unreadable cache file simply triggers a fresh download,
+    and a frame is only cached when every requested ticker has at least one
+    close, so partial failures are retried on the next call.
+    Downloads are serialised across threads because ``yf.download`` is not
+    thread-safe.
+    """
+    options = ",".join(f"{k}={v!r}" for k, v in sorted(kwargs.items()))
+    path = _cache_path(f"{tickers}|{start}|{date.today().isoformat()}|{options}")
+
+    cached = _read_cache(path)
+    if cached is not None:
+        logger.debug("Using cached download for {} from {}", tickers, start)
+        return cached
+
+    with _DOWNLOAD_LOCK:
+        data = yf.download(tickers, start=start, **kwargs)
+
+    if _is_complete(data, tickers):
+        _write_cache(path, data)
+
+    return data
+
+
+def _is_complete(data: pd.DataFrame, tickers: str) -> bool:
+    """Return whether *data* has a non-empty ``Close`` column for every symbol in *tickers*.
+
+    yfinance upper-cases symbols in multi-ticker frames and keeps an all-NaN
+    column group for tickers that failed, so both the column set and the
+    values are checked.  Single-ticker frames must have flat, unique columns.
+    """
+    requested = {t.upper() for t in tickers.split()}
+    if data.empty:
+        return False
+    if isinstance(data.columns, pd.MultiIndex):
+        if set(data.columns.get_level_values(0)) != requested:
+            return False
+        closes = data.xs("Close", axis=1, level=1)
+        return bool(closes.notna().any().all())
+    return (
+        len(requested) == 1
+        and data.columns.is_unique
+        and "Close" in data.columns
+        and bool(data["Close"].notna().any())
+    )
+
+
+def _cache_path(key: str) -> Path:
+    """Return the cache file used for *key*."""
+    return _CACHE_DIR / f"{hashlib.sha1(key.encode()).hexdigest()}.pkl"
+
+
+def _read_cache(path: Path) -> pd.DataFrame | None:
+    """Return the frame cached at *path*, or ``None`` if it is missing, stale or unreadable."""
+    try:
+        if path.exists() and time.time() - path.stat().st_mtime < _CACHE_TTL_SECONDS:
+            data: pd.DataFrame = pd.read_pickle(path)
+            return data
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Ignoring unreadable cache file {}: {}", path, exc)
+    return None
+
+
+def _write_cache(path: Path, data: pd.DataFrame) -> None:
+    """Cache *data* at *path* and delete cache files older than the TTL."""
+    try:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        data.to_pickle(path)
+        cutoff = time.time() - _CACHE_TTL_SECONDS
+        for stale in _CACHE_DIR.glob("*.pkl"):
+            if stale.stat().st_mtime < cutoff:
+                stale.unlink(missing_ok=True)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Failed to write cache file {}: {}", path, exc)
+
+
+def history(ticker: str, start: str) -> pd.DataFrame:
+    """Return adjusted daily history for a single *ticker* from *start* to today.
+
+    Unlike ``yf.download``, ``Ticker.history`` keeps no module-level state, so
+    it is safe to call from several threads at once, including while a
+    batched ``download`` is running.  Results share the on-disk cache used by
+    ``download``, under the same same-day and completeness rules.
+    """
+    path = _cache_path(f"history|{ticker}|{start}|{date.today().isoformat()}")
+
+    cached = _read_cache(path)
+    if cached is not None:
+        logger.debug("Using cached history for {} from {}", ticker, start)
+        return cached
+
+    data: pd.DataFrame = yf.Ticker(ticker).history(start=start, auto_adjust=True)
+
+    if _is_complete(data, ticker):
+        _write_cache(path, data)
+
+    return data
@@ -0,0 +1,67 @@
+"""Tests for the backfill high-water-mark helpers in ``portfolio_updater.main``."""
+
+from portfolio_updater.main import _price_fetch_starts, _price_watermarks
+from portfolio_updater.models import PriceBatch
+
+EARLIEST = "2023-01-03"
+
+
+def _marks(ticker: str, first: str, last: str) -> dict[str, str]:
+    return {f"first_price_fetched:{ticker}": first, f"last_price_fetched:{ticker}": last}
+
+
+def test_fetch_starts_without_marks_fetch_full_history() -> None:
+    assert _price_fetch_starts(["AAPL", "2330.TW"], EARLIEST, {}) == {}
+
+
+def test_fetch_starts_resume_from_last_mark() -> None:
+    metadata = _marks("AAPL", "2022-06-01", "2024-05-10")
+
+    assert _price_fetch_starts(["AAPL"], EARLIEST, metadata) == {"AAPL": "2024-05-10"}
+
+
+def test_fetch_starts_ignore_marks_when_investment_predates_history() -> None:
+    # History was first fetched from 2023-06-01, but an investment now dates
+    # back to EARLIEST, so the ticker must be fetched from EARLIEST again.
+    metadata = _marks("AAPL", "2023-06-01", "2024-05-10")
+
+    assert _price_fetch_starts(["AAPL"], EARLIEST, metadata) == {}
+
+
+def test_fetch_starts_need_both_marks() -> None:
+    metadata = {"last_price_fetched:AAPL": "2024-05-10"}
+
+    assert _price_fetch_starts(["AAPL"], EARLIEST, metadata) == {}
+
+
+def test_watermarks_for_full_and_resumed_fetches() -> None:
+    prices = PriceBatch.from_columns(
+        ["AAPL", "AAPL", "2330.TW"],
+        ["2024-05-10", "2024-05-13", "2024-05-13"],
+        [190.0, 191.0, 800.0],
+    )
+    metadata = _marks("AAPL", "2022-06-01", "2024-05-10")
+
+    marks = _price_watermarks(prices, EARLIEST, {"AAPL": "2024-05-10"}, metadata)
+
+    assert marks == {
+        # Resumed ticker keeps its original history start.
+        "first_price_fetched:AAPL": "2022-06-01",
+        "last_price_fetched:AAPL": "2024-05-13",
+        # Fully fetched ticker starts at the earliest investment date.
+        "first_price_fetched:2330.TW": EARLIEST,
+        "last_price_fetched:2330.TW": "2024-05-13",
+    }
+
+
+def test_watermarks_skip_tickers_missing_from_prices() -> None:
+    prices = PriceBatch.from_columns(["AAPL"], ["2024-05-13"], [191.0])
+    metadata = _marks("MSFT", "2022-06-01", "2024-05-10")
+
+    marks = _price_watermarks(prices, EARLIEST, {"MSFT": "2024-05-10"}, metadata)
+
+    # MSFT returned nothing, so its existing marks are left untouched.
+    assert marks == {
+        "first_price_fetched:AAPL": EARLIEST,
+        "last_price_fetched:AAPL": "2024-05-13",
+    }
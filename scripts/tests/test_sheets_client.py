@@ -0,0 +1,69 @@
+"""Tests for investment row parsing in ``portfolio_updater.sheets_client``."""
+
+from portfolio_updater.sheets_client import _INVESTMENT_HEADERS, _parse_investments
+
+ROW = ["1", "b1", "AAPL", "Apple", "US", "2024-01-02", "10", "185.5", "31.2", "15", "core"]
+
+
+def test_parse_investments_by_position() -> None:
+    (inv,) = _parse_investments([_INVESTMENT_HEADERS, ROW])
+
+    assert inv.ticker == "AAPL"
+    assert inv.market == "US"
+    assert inv.units == 10.0
+    assert inv.price_per_unit == 185.5
+    assert inv.tags == "core"
+
+
+def test_parse_investments_defaults_missing_trailing_tags() -> None:
+    (inv,) = _parse_investments([_INVESTMENT_HEADERS, ROW[:10]])
+
+    assert inv.tags == ""
+
+
+def test_parse_investments_skips_bad_market_and_numbers() -> None:
+    bad_market = ROW[:4] + ["JP"] + ROW[5:]
+    bad_units = ROW[:6] + ["1,000"] + ROW[7:]
+
+    investments = _parse_investments([_INVESTMENT_HEADERS, bad_market, bad_units, ROW])
+
+    assert [inv.id for inv in investments] == ["1"]
+
+
+def test_parse_investments_skips_blank_rows() -> None:
+    assert _parse_investments([_INVESTMENT_HEADERS, [], [""] * 11]) == []
+
+
+def test_parse_investments_falls_back_to_header_names() -> None:
+    # Columns reordered and capitalised: the positional fast path must not be used.
+    header = [
+        "Ticker",
+        "ID",
+        "batch_id",
+        "name",
+        "market",
+        "date",
+        "units",
+        "price_per_unit",
+        "exchange_rate",
+        "fees",
+        "tags",
+    ]
+    row = ["AAPL", "1", "b1", "Apple", "US", "2024-01-02", "10", "185.5", "31.2", "15"]
+
+    (inv,) = _parse_investments([header, row])
+
+    assert inv.ticker == "AAPL"
+    assert inv.id == "1"
+    assert inv.tags == ""
+
+
+def test_parse_investments_by_name_validates_market() -> None:
+    header = list(reversed(_INVESTMENT_HEADERS))
+    row = list(reversed(ROW[:4] + ["JP"] + ROW[5:]))
+
+    assert _parse_investments([header, row]) == []
+
+
+def test_parse_investments_empty_sheet() -> None:
+    assert _parse_investments([]) == []